@@ -1,6 +1,8 @@
 import os
 from fastapi import FastAPI
 from pydantic import BaseModel
+from typing import List
+import numpy as np
 import pandas as pd
 import mlflow.pyfunc
 import logging
@@ -48,16 +50,17 @@ class HousingRequest(BaseModel):
     latitude: float
     longitude: float
 
-@app.get("/")
-def root():
-    return {"message": "Housing price prediction API is running."}
+class BatchHousingRequest(BaseModel):
+    rows: List[HousingRequest]
 
-@app.post("/predict")
-def predict(data: HousingRequest):
-    global prediction_count
-    prediction_count += 1
+final_features = [
+    "MedInc", "HouseAge", "AveRooms", "AveBedrms",
+    "Population", "AveOccup", "Latitude", "Longitude"
+]
 
-    df = pd.DataFrame([data.dict()])
+def prepare_features(rows):
+    """Build the model feature matrix from a list of request dicts"""
+    df = pd.DataFrame(rows)
 
     # Feature engineering
     df["AveRooms"] = df["total_rooms"] / df["households"]
@@ -73,22 +76,48 @@ def predict(data: HousingRequest):
         "population": "Population"
     }, inplace=True)
 
-    final_features = [
-        "MedInc", "HouseAge", "AveRooms", "AveBedrms",
-        "Population", "AveOccup", "Latitude", "Longitude"
-    ]
+    # The models are fitted on plain float32 arrays, so hand predict the
+    # same thing - passing the named frame triggers a feature-name
+    # UserWarning on every request
+    return df[final_features].to_numpy(dtype=np.float32)
 
-    prediction = model.predict(df[final_features])[0]
-
-    # Log to file and SQLite
-    input_data = data.dict()
+def log_prediction(input_data, prediction):
+    """Log one prediction to the log file and SQLite"""
     logging.info(f"Input: {input_data} | Prediction: {prediction}")
     cursor.execute("INSERT INTO housinglogs (timestamp, inputs, prediction) VALUES (?, ?, ?)",
                    (datetime.utcnow().isoformat(), str(input_data), str(prediction)))
+
+@app.get("/")
+def root():
+    return {"message": "Housing price prediction API is running."}
+
+@app.post("/predict")
+def predict(data: HousingRequest):
+    global prediction_count
+    prediction_count += 1
+
+    prediction = model.predict(prepare_features([data.dict()]))[0]
+
+    log_prediction(data.dict(), prediction)
     conn.commit()
 
     return {"predicted_price": float(prediction)}
 
+@app.post("/predict_batch")
+def predict_batch(data: BatchHousingRequest):
+    """Predict many rows in one round-trip, amortizing HTTP/JSON overhead"""
+    global prediction_count
+    prediction_count += len(data.rows)
+
+    inputs = [row.dict() for row in data.rows]
+    predictions = model.predict(prepare_features(inputs))
+
+    for input_data, prediction in zip(inputs, predictions):
+        log_prediction(input_data, prediction)
+    conn.commit()
+
+    return {"predictions": [float(p) for p in predictions]}
+
 @app.get("/metrics")
 def metrics():
     return {"total_predictions": prediction_count}
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
+import numpy as np
 import pandas as pd
 # import mlflow.pyfunc  # Uncomment if using MLflow
 import joblib
@@ -70,8 +71,9 @@ def predict(data: IrisRequest):
     }
     input_df = pd.DataFrame([input_dict])
 
-    # Predict
-    prediction = model.predict(input_df)
+    # Predict on a plain float32 array; the model is fitted without
+    # feature names, so passing the frame warns on every request
+    prediction = model.predict(input_df.to_numpy(dtype=np.float32))
     predicted_class = int(prediction[0])
 
     # Log to file
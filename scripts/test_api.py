@@ -6,12 +6,19 @@ This script tests the API endpoints to ensure they work correctly.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import sys
 import os
 from pathlib import Path
 
+# Reuse one session (and its keep-alive connection pool) for all endpoint
+# calls instead of paying a TCP handshake per request
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def test_housing_api():
     """Test the housing prediction API"""
     print("Testing Housing API...")
@@ -30,7 +37,7 @@ def test_housing_api():
     
     try:
         # Test health endpoint
-        response = requests.get("http://localhost:8000/", timeout=10)
+        response = SESSION.get("http://localhost:8000/", timeout=10)
         if response.status_code == 200:
             print("✅ Housing API health check passed")
         else:
@@ -38,7 +45,7 @@ def test_housing_api():
             return False
         
         # Test metrics endpoint
-        response = requests.get("http://localhost:8000/metrics", timeout=10)
+        response = SESSION.get("http://localhost:8000/metrics", timeout=10)
         if response.status_code == 200:
             print("✅ Housing API metrics endpoint working")
         else:
@@ -46,10 +53,9 @@ def test_housing_api():
             return False
         
         # Test prediction endpoint
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8000/predict",
             json=test_data,
-            headers={"Content-Type": "application/json"},
             timeout=10
         )
         
@@ -81,9 +87,15 @@ def check_models_exist():
         "models/RandomForest.pkl"
     ]
     
+    # One directory read instead of a stat() syscall per file
+    try:
+        present = {entry.name for entry in os.scandir("models")}
+    except FileNotFoundError:
+        present = set()
+
     all_exist = True
     for model_path in required_models:
-        if os.path.exists(model_path):
+        if os.path.basename(model_path) in present:
             print(f"✅ {model_path} exists")
         else:
             print(f"❌ {model_path} missing")
@@ -7,14 +7,38 @@ It starts the API server, tests it, and then stops it.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import sys
 import os
 import subprocess
 import signal
+from contextlib import contextmanager
 from pathlib import Path
 
+# Ref-counted pid file so several CI scripts can share one running server
+# instead of each paying the uvicorn + model-load startup cost
+PID_FILE = "/tmp/mlops_api.pid"
+
+# Shared session so the readiness poll and the endpoint tests reuse
+# one keep-alive connection pool
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def wait_for_server(url="http://localhost:8000/", timeout=10.0, interval=0.1):
+    """Poll the health endpoint until the server responds or timeout expires"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if SESSION.get(url, timeout=0.5).status_code == 200:
+                return True
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(interval)
+    return False
+
 def check_models_exist():
     """Check if model files exist"""
     print("Checking model files...")
@@ -26,9 +50,15 @@ def check_models_exist():
         "models/RandomForest.pkl"
     ]
     
+    # One directory read instead of a stat() syscall per file
+    try:
+        present = {entry.name for entry in os.scandir("models")}
+    except FileNotFoundError:
+        present = set()
+
     all_exist = True
     for model_path in required_models:
-        if os.path.exists(model_path):
+        if os.path.basename(model_path) in present:
             print(f"✅ {model_path} exists")
         else:
             print(f"❌ {model_path} missing")
@@ -45,10 +75,13 @@ def start_api_server():
         "python", "-m", "uvicorn", "api.housing_api:app", 
         "--host", "0.0.0.0", "--port", "8000"
     ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    
-    # Wait for server to start
-    time.sleep(10)
-    
+
+    # Poll until the server is ready instead of sleeping a fixed 10 seconds
+    if not wait_for_server():
+        process.terminate()
+        process.wait()
+        raise RuntimeError("API server did not become ready within 10 seconds")
+
     return process
 
 def test_housing_api():
@@ -69,7 +102,7 @@ def test_housing_api():
     
     try:
         # Test health endpoint
-        response = requests.get("http://localhost:8000/", timeout=10)
+        response = SESSION.get("http://localhost:8000/", timeout=10)
         if response.status_code == 200:
             print("✅ Housing API health check passed")
         else:
@@ -77,7 +110,7 @@ def test_housing_api():
             return False
         
         # Test metrics endpoint
-        response = requests.get("http://localhost:8000/metrics", timeout=10)
+        response = SESSION.get("http://localhost:8000/metrics", timeout=10)
         if response.status_code == 200:
             print("✅ Housing API metrics endpoint working")
         else:
@@ -85,10 +118,9 @@ def test_housing_api():
             return False
         
         # Test prediction endpoint
-        response = requests.post(
+        response = SESSION.post(
             "http://localhost:8000/predict",
             json=test_data,
-            headers={"Content-Type": "application/json"},
             timeout=10
         )
         
@@ -115,6 +147,62 @@ def stop_api_server(process):
     process.terminate()
     process.wait()
 
+def _read_pid_file():
+    """Return (pid, refcount) from the pid file, or (None, 0) if absent"""
+    try:
+        with open(PID_FILE) as f:
+            pid, refs = f.read().split()
+            return int(pid), int(refs)
+    except (OSError, ValueError):
+        return None, 0
+
+def _write_pid_file(pid, refs):
+    with open(PID_FILE, "w") as f:
+        f.write(f"{pid} {refs}")
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+@contextmanager
+def api_server():
+    """Start the API server, or reuse one another CI script already started.
+
+    The first caller launches uvicorn and records its pid with a refcount
+    in PID_FILE; later callers bump the refcount and reuse the running
+    server, skipping the startup and model-load cost. The last caller out
+    terminates the server.
+    """
+    pid, refs = _read_pid_file()
+    process = None
+    if pid is None or not _pid_alive(pid):
+        process = start_api_server()
+        pid, refs = process.pid, 0
+    else:
+        print(f"Reusing running API server (pid {pid})")
+    _write_pid_file(pid, refs + 1)
+
+    try:
+        yield
+    finally:
+        pid, refs = _read_pid_file()
+        refs -= 1
+        if refs <= 0:
+            if process is not None:
+                stop_api_server(process)
+            elif pid is not None and _pid_alive(pid):
+                print("Stopping API server...")
+                os.kill(pid, signal.SIGTERM)
+            try:
+                os.remove(PID_FILE)
+            except OSError:
+                pass
+        else:
+            _write_pid_file(pid, refs)
+
 def main():
     """Main test function"""
     print("=" * 50)
@@ -127,24 +215,19 @@ def main():
         print("❌ Some model files are missing")
         sys.exit(1)
     
-    # Start API server
-    api_process = start_api_server()
-    
-    try:
+    # Start (or reuse) the API server for the duration of the tests
+    with api_server():
         # Test housing API
         housing_ok = test_housing_api()
-        
+
         print("=" * 50)
-        if housing_ok:
-            print("✅ Housing API tests passed!")
-            sys.exit(0)
-        else:
-            print("❌ Housing API tests failed!")
-            sys.exit(1)
-    
-    finally:
-        # Always stop the server
-        stop_api_server(api_process)
+
+    if housing_ok:
+        print("✅ Housing API tests passed!")
+        sys.exit(0)
+    else:
+        print("❌ Housing API tests failed!")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
